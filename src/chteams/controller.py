@@ -0,0 +1,68 @@
+"""Controller protocol and backend registry for the chteams utility.
+
+The engine only depends on the ``Controller`` protocol, so platform backends
+(and the in-process fake used for load testing) can be swapped from the CLI.
+"""
+from typing import Callable, Dict, Optional, Protocol, Sequence, runtime_checkable
+
+from .fake import FakeController
+from .macos import MacOSController
+from .targets import Target
+
+
+@runtime_checkable
+class Controller(Protocol):
+    """System operations the activity engine needs from a backend."""
+
+    def start_caffeinate(self) -> bool:
+        """Prevents system sleep, returning True on success."""
+        ...
+
+    def stop_caffeinate(self):
+        """Releases the sleep prevention started by ``start_caffeinate``."""
+        ...
+
+    def interact(self, targets: Sequence[Target], frontmost_app: Optional[str] = None):
+        """Serves every target in a single focus-and-restore cycle.
+
+        ``frontmost_app`` is the already known foreground application; when
+        omitted the backend looks it up itself.
+
+        Raises:
+            InteractionError: If any target interaction fails.
+        """
+        ...
+
+    def notify(self, title: str, message: str):
+        """Displays a user-facing notification."""
+        ...
+
+    def get_frontmost_app(self) -> str:
+        """Returns the name of the frontmost application, or an empty string."""
+        ...
+
+
+BACKENDS: Dict[str, Callable[..., Controller]] = {
+    "macos": MacOSController,
+    "fake": FakeController,
+}
+
+
+def create_controller(name: str, **options) -> Controller:
+    """Instantiates the backend registered under ``name``.
+
+    Args:
+        name: A key of ``BACKENDS``.
+        **options: Keyword arguments forwarded to the backend constructor.
+
+    Returns:
+        Controller: The constructed backend.
+
+    Raises:
+        ValueError: If no backend is registered under ``name``.
+    """
+    try:
+        factory = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown controller backend: '{name}'") from None
+    return factory(**options)
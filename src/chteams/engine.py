@@ -1,45 +1,58 @@
+import math
 import time
 import logging
+from contextlib import nullcontext
+from dataclasses import replace
 from datetime import datetime, timedelta
+from typing import ContextManager, Dict, List, Optional, Sequence, Tuple
 from rich.live import Live
-from .macos import MacOSController
+from rich.panel import Panel
+from .controller import Controller
+from .frontmost import FrontmostTracker
+from .keyboard import InputHandler
+from .profiling import SessionProfiler
+from .scheduler import DEFAULT_MERGE_WINDOW, TargetScheduler
+from .targets import TEAMS, InteractionError, Target, TargetStatus
 from .ui import create_dashboard
-from threading import Thread, Event
 
 logger = logging.getLogger(__name__)
 
-
-class InputHandler(Thread):
-    """A dedicated thread to handle blocking user input."""
-    def __init__(self):
-        super().__init__(daemon=True)
-        self.pause_requested = Event()
-        self.stopped = Event()
-
-    def run(self):
-        while not self.stopped.is_set():
-            try:
-                # This will block until the user presses Enter
-                line = input() 
-                logger.info(f"[INPUT THREAD] Received: '{line.strip()}'")
-                if line.strip().lower() == 'p':
-                    self.pause_requested.set()
-            except EOFError:
-                # This can happen if stdin is closed
-                break
-    
-    def stop(self):
-        self.stopped.set()
+MIN_INTERVAL = 30
+MAX_FAILURES = 3
+SETTLE_SECONDS = 5
+MAX_DEFER = 30
+DASHBOARD_REFRESH = 1.0
 
 
 class ActivityEngine:
     """Orchestrates the simulation loop to maintain active status."""
 
-    def __init__(self, controller: MacOSController, interval: int = 240, debug: bool = False):
-        """Initializes the engine with a controller and simulation interval."""
+    def __init__(
+        self,
+        controller: Controller,
+        interval: Optional[int] = None,
+        debug: bool = False,
+        profiler: Optional[SessionProfiler] = None,
+        targets: Optional[Sequence[Target]] = None,
+        merge_window: int = DEFAULT_MERGE_WINDOW,
+        settle_seconds: int = SETTLE_SECONDS,
+        max_defer: int = MAX_DEFER,
+    ):
+        """Initializes the engine with a controller and simulation interval.
+
+        When no targets are given, Microsoft Teams is kept active. An explicit
+        ``interval`` replaces the registered interval of every target. A due
+        interaction is postponed until the frontmost app has been unchanged
+        for ``settle_seconds`` (0 disables this), but never for longer than
+        ``max_defer`` seconds.
+        """
+        if not targets:
+            targets = [TEAMS]
+        if interval is not None:
+            targets = [replace(target, interval=interval) for target in targets]
         self.controller = controller
-        self.interval = interval
         self.debug = debug
+        self.profiler = profiler
         self.is_running = False
         self.paused = False
         self.start_time = None
@@ -47,16 +60,57 @@ class ActivityEngine:
         self.activity_count = 0
         self.last_message = ""
         self.message_expiry = None
+        self.act_now = False
+        self.targets: Dict[str, Target] = {target.name: target for target in targets}
+        self.target_status: Dict[str, TargetStatus] = {name: TargetStatus() for name in self.targets}
+        self.scheduler = TargetScheduler(targets, merge_window)
+        self.focus_cycles = 0
+        self.settle_seconds = settle_seconds
+        self.max_defer = max_defer
+        self.frontmost = FrontmostTracker(controller.get_frontmost_app)
+        self.deferred_count = 0
+        self.focus_skips = 0
+        self._deferred_since: Optional[int] = None
+        self._clock = 0
+        self._rendered_at: Optional[float] = None
+        self._tick_deadline: Optional[float] = None
         self.input_handler = InputHandler()
 
     def _handle_input(self):
-        """Checks if the input handler has requested a pause."""
+        """Applies pause, act-now, quit and interval requests from the input handler."""
         if self.input_handler.pause_requested.is_set():
             self.paused = not self.paused
             msg = f"Engine {'paused' if self.paused else 'resumed'}"
             self._set_message(msg)
             logger.info(msg)
             self.input_handler.pause_requested.clear() # Reset for next toggle
+        if self.input_handler.act_now_requested.is_set():
+            self.input_handler.act_now_requested.clear()
+            self.act_now = True
+            self._set_message("Action requested")
+            logger.info("Immediate action requested.")
+        if self.input_handler.quit_requested.is_set():
+            self.input_handler.quit_requested.clear()
+            self.stop()
+        delta = self.input_handler.take_interval_delta()
+        if delta:
+            self.scheduler.adjust_intervals(delta, MIN_INTERVAL)
+            msg = f"Interval set to {self._describe_intervals()}"
+            self._set_message(msg)
+            logger.info(msg)
+
+    def _describe_intervals(self) -> str:
+        """Formats the target intervals, e.g. ``240s`` or ``Microsoft Teams 240s, Slack 300s``."""
+        targets = list(self.scheduler.targets.values())
+        if len({target.interval for target in targets}) == 1:
+            return f"{targets[0].interval}s"
+        return ", ".join(f"{target.app_name} {target.interval}s" for target in targets)
+
+    def _profile_cycle(self) -> ContextManager:
+        """Returns the profiler's cycle context, or a no-op when profiling is off."""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.cycle()
 
     def _set_message(self, msg: str, duration: int = 5):
         """Sets a message to be displayed on the dashboard for a duration."""
@@ -81,11 +135,16 @@ class ActivityEngine:
         self.is_running = True
         self.start_time = datetime.now()
         self.controller.start_caffeinate()
-        self.input_handler.start()
 
-        logger.info(f"Engine started. Interval: {self.interval}s. Press 'p' then Enter to pause.")
-        
         try:
+            # Started inside the try so a failure or Ctrl+C here still stops the
+            # non-daemon reader thread and restores the terminal.
+            self.input_handler.start()
+            if self.profiler is not None:
+                self.profiler.start()
+
+            logger.info(f"Engine started. Interval: {self._describe_intervals()}. Press 'p' to pause, 'n' to act now, 'q' to quit.")
+
             if self.debug:
                 logger.info("Running in debug mode. Dashboard disabled.")
                 self._run_debug_mode()
@@ -96,71 +155,247 @@ class ActivityEngine:
         finally:
             self.input_handler.stop()
             self.controller.stop_caffeinate()
+            if self.profiler is not None:
+                self.profiler.stop()
+            logger.info(
+                f"Focus cycles: {self.focus_cycles}, deferred: {self.deferred_count}, "
+                f"focus round trips skipped: {self.focus_skips}."
+            )
 
         return self._get_uptime(), self.activity_count
 
+    def _due_targets(self) -> List[Target]:
+        """Returns the targets to serve now, honouring pause and act-now requests."""
+        if self.act_now:
+            self.act_now = False
+            self._deferred_since = None
+            return self.scheduler.pop_all()
+        if self.paused:
+            self._deferred_since = None
+            return []
+        due = self.scheduler.peek_due(self._clock)
+        if not due or self._should_defer(due):
+            return []
+        return self.scheduler.pop_due(self._clock)
+
+    def _should_defer(self, due: Sequence[Target]) -> bool:
+        """Returns True to postpone a due interaction while the user switches apps.
+
+        Interactions go ahead once the frontmost app has been stable for
+        ``settle_seconds``, when one of the ``due`` targets is already
+        frontmost, or after ``max_defer`` seconds of postponing.
+        """
+        if not self.settle_seconds:
+            return False
+        if self._deferred_since is None:
+            app = self.frontmost.sample(self._clock, force=True)
+        else:
+            # A change is only confirmed settle_seconds later, so re-probe at that pace
+            app = self.frontmost.sample(self._clock, max_age=self.settle_seconds)
+        target_apps = {target.app_name for target in due}
+        settled = self.frontmost.stable_for(self._clock) >= self.settle_seconds
+        if settled or app in target_apps:
+            self._deferred_since = None
+            return False
+        if self._deferred_since is None:
+            self._deferred_since = self._clock
+            self.deferred_count += 1
+            logger.info(f"Deferring interaction while '{app}' settles in the foreground.")
+        if self._clock - self._deferred_since >= self.max_defer:
+            logger.info(f"Interacting after deferring for {self.max_defer} seconds.")
+            self._deferred_since = None
+            return False
+        return True
+
+    def _interact(self, targets: List[Target]) -> Dict[str, str]:
+        """Serves the targets in one focus cycle and records their outcomes.
+
+        Args:
+            targets: The due targets.
+
+        Returns:
+            Dict[str, str]: Error messages keyed by the names of failed targets.
+        """
+        self.focus_cycles += 1
+        self._deferred_since = None
+        app = self.frontmost.sample(self._clock)
+        if any(target.app_name == app for target in targets):
+            self.focus_skips += 1
+            logger.debug(f"'{app}' is already frontmost; skipping its focus round trip.")
+        try:
+            self.controller.interact(targets, frontmost_app=app or None)
+            failures = {}
+        except InteractionError as e:
+            failures = e.failures
+        except RuntimeError as e:
+            failures = {target.name: str(e) for target in targets}
+
+        now = datetime.now().strftime("%H:%M:%S")
+        for target in targets:
+            state = self.target_status[target.name]
+            if target.name in failures:
+                state.status = "Failed"
+                state.consecutive_failures += 1
+            else:
+                state.status = "OK"
+                state.last_action = now
+                state.interactions += 1
+                state.consecutive_failures = 0
+                self.activity_count += 1
+                self.last_action_time = now
+        self.scheduler.reschedule(targets, self._clock)
+        return failures
+
+    def _handle_failures(self, failures: Dict[str, str]):
+        """Notifies about failed targets and disables those failing persistently.
+
+        Stops the engine once every target has been disabled.
+        """
+        for name, error in failures.items():
+            app_name = self.targets[name].app_name
+            count = self.target_status[name].consecutive_failures
+            logger.error(f"Activity simulation failed for {app_name} ({count}/{MAX_FAILURES}): {error}")
+            self.controller.notify("CHTEAMS Error", f"Failed to interact with {app_name} ({count}/{MAX_FAILURES})")
+
+            if count >= MAX_FAILURES:
+                logger.warning(f"Disabling {app_name} after {count} consecutive failures.")
+                self.scheduler.remove(name)
+                self.target_status[name].status = "Disabled"
+                if len(self.scheduler):
+                    self.controller.notify("CHTEAMS Target Disabled", f"Stopped interacting with {app_name}.")
+
+        if not len(self.scheduler):
+            logger.critical("Too many consecutive failures. Shutting down.")
+            self.controller.notify("CHTEAMS Shutting Down", "Stopping engine due to persistent errors.")
+            self.is_running = False
+
+    def _target_rows(self) -> List[Tuple[str, str, str, str, str]]:
+        """Returns (app, status, last action, next action, interval) rows for the dashboard."""
+        rows = []
+        for name, target in self.targets.items():
+            state = self.target_status[name]
+            deadline = self.scheduler.next_deadline(name)
+            next_act = "-" if deadline is None else f"{max(0, math.ceil(deadline - self._clock))}s"
+            interval = self.scheduler.targets.get(name, target).interval
+            rows.append((target.app_name, state.status, state.last_action, next_act, f"{interval}s"))
+        return rows
+
+    def _dashboard(self, status: str, next_act: str) -> Panel:
+        """Builds the dashboard panel for the current engine state."""
+        return create_dashboard(
+            status,
+            self._get_uptime(),
+            self.last_action_time,
+            next_act,
+            None,
+            self._get_current_message(),
+            self._target_rows(),
+            (self.deferred_count, self.focus_skips),
+        )
+
+    def _render(self, live: Live, status: str, next_act: str, force: bool = False):
+        """Updates the live dashboard at most once per ``DASHBOARD_REFRESH`` seconds."""
+        now = time.monotonic()
+        if not force and self._rendered_at is not None and now - self._rendered_at < DASHBOARD_REFRESH:
+            return
+        self._rendered_at = now
+        live.update(self._dashboard(status, next_act))
+
+    def _tick(self) -> bool:
+        """Waits for the rest of the current clock second, waking up on keystrokes.
+
+        Returns:
+            bool: True once the second has elapsed, False if a key arrived first.
+        """
+        if self._tick_deadline is None:
+            self._tick_deadline = time.monotonic() + 1
+        timeout = max(0.0, self._tick_deadline - time.monotonic())
+        if self.input_handler.key_pressed.wait(timeout):
+            self.input_handler.key_pressed.clear()
+            return False
+        self._tick_deadline = None
+        return True
+
+    def _wait_for_next(self, live: Optional[Live] = None):
+        """Waits in one-second ticks until the next deadline.
+
+        Each tick advances the scheduler clock. When a deadline has already
+        passed while paused, the wait lasts until the engine is resumed. The
+        wait ends early when the engine stops or an immediate action is
+        requested.
+        """
+        wait = self.scheduler.seconds_until_next(self._clock)
+        hold = self.paused and not wait
+        if self._deferred_since is not None:
+            wait = max(wait, 1)
+        sample_from = max(0, wait - self.settle_seconds)
+        if live is None:
+            if hold:
+                logger.info("Waiting until the engine is resumed...")
+            elif wait:
+                logger.info(f"Waiting for {wait} seconds...")
+        remaining = wait
+        self._tick_deadline = None
+        while remaining > 0 or (hold and self.paused):
+            self._handle_input()
+            if not self.is_running or self.act_now:
+                break
+            # One probe when the settle window opens; the deadline check adds a second
+            if self.settle_seconds and self._deferred_since is None and remaining > 0 \
+                    and wait - remaining == sample_from:
+                self.frontmost.sample(self._clock)
+            if live is not None:
+                status_msg = "PAUSED" if self.paused else "Waiting"
+                next_act_str = f"{remaining}s" if not self.paused else "Paused"
+                self._render(live, status_msg, next_act_str, force=True)
+            if self._tick():
+                self._clock += 1
+                remaining -= 1
+
     def _run_debug_mode(self):
         """A simple, log-focused run loop for debugging."""
         while self.is_running:
-            self._handle_input()
-            if self.paused:
-                logger.info("Engine is paused. Skipping activity.")
-            else:
-                logger.info("Simulating activity...")
-                try:
-                    self.controller.focus_teams_and_interact()
-                    self.activity_count += 1
-                    logger.info("Activity simulation successful.")
-                except RuntimeError as e:
-                    logger.error(f"Activity simulation failed: {e}")
-            
-            logger.info(f"Waiting for {self.interval} seconds...")
-            for _ in range(self.interval):
-                if not self.is_running:
-                    break
+            with self._profile_cycle():
                 self._handle_input()
-                time.sleep(1)
+                targets = self._due_targets()
+                if self.paused and not targets:
+                    logger.info("Engine is paused. Skipping activity.")
+                elif targets:
+                    names = ", ".join(target.app_name for target in targets)
+                    logger.info(f"Simulating activity for {names}...")
+                    failures = self._interact(targets)
+                    for name, error in failures.items():
+                        logger.error(f"Activity simulation failed for {self.targets[name].app_name}: {error}")
+                    if len(failures) < len(targets):
+                        logger.info("Activity simulation successful.")
+
+            self._wait_for_next()
 
     def _run_live_mode(self):
         """The main run loop with the Rich live dashboard."""
-        consecutive_failures = 0
-        max_failures = 3
-
-        with Live(create_dashboard("Starting...", "00:00:00", "Never", "N/A", self.interval, self._get_current_message()), refresh_per_second=1) as live:
+        with Live(self._dashboard("Starting...", "N/A"), refresh_per_second=1) as live:
             while self.is_running:
-                self._handle_input() 
-                if self.paused:
-                    current_status = "PAUSED"
-                else:
-                    current_status = "Simulating Activity"
-                    try:
-                        self.controller.focus_teams_and_interact()
-                        self.activity_count += 1
-                        self.last_action_time = datetime.now().strftime("%H:%M:%S")
-                        consecutive_failures = 0
-                    except RuntimeError as e:
-                        consecutive_failures += 1
-                        logger.error(f"Activity simulation failed ({consecutive_failures}/{max_failures}): {e}")
-                        self.controller.notify("CHTEAMS Error", f"Failed to interact with Teams ({consecutive_failures}/{max_failures})")
-                        
-                        if consecutive_failures >= max_failures:
-                            logger.critical("Too many consecutive failures. Shutting down.")
-                            self.controller.notify("CHTEAMS Shutting Down", "Stopping engine due to persistent errors.")
-                            self.is_running = False
-                            current_status = "ERROR - SHUTTING DOWN"
-
-                if not self.is_running:
-                    live.update(create_dashboard(current_status, self._get_uptime(), self.last_action_time, "Stopped", self.interval, self._get_current_message()))
-                    break
-
-                for remaining in range(self.interval, 0, -1):
+                with self._profile_cycle():
+                    self._handle_input()
+                    current_status = "PAUSED" if self.paused else "Waiting"
+                    targets = self._due_targets()
+                    if targets:
+                        current_status = "Simulating Activity"
+                        failures = self._interact(targets)
+                        if failures:
+                            self._handle_failures(failures)
+                            if not self.is_running:
+                                current_status = "ERROR - SHUTTING DOWN"
+
                     if not self.is_running:
+                        self._render(live, current_status, "Stopped", force=True)
                         break
-                    self._handle_input()
-                    status_msg = "PAUSED" if self.paused else "Waiting"
-                    next_act_str = f"{remaining}s" if not self.paused else "Paused"
-                    live.update(create_dashboard(status_msg, self._get_uptime(), self.last_action_time, next_act_str, self.interval, self._get_current_message()))
-                    time.sleep(1)
+
+                    # Cycles that do not wait (e.g. zero intervals with the fake backend) still refresh
+                    next_act = "Paused" if self.paused else f"{self.scheduler.seconds_until_next(self._clock)}s"
+                    self._render(live, current_status, next_act)
+
+                self._wait_for_next(live)
 
     def stop(self):
         """Stops the activity loop gracefully."""
@@ -0,0 +1,108 @@
+"""In-process fake controller for load testing and fuzzing the engine.
+
+Simulates interaction latency and failures from configurable distributions
+without touching the operating system, so the engine, dashboard and
+scheduling logic can be exercised at thousands of cycles per second.
+"""
+import logging
+import random
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+from .targets import InteractionError, Target
+
+logger = logging.getLogger(__name__)
+
+
+class FakeController:
+    """A deterministic, seedable stand-in for the platform controllers.
+
+    Latency is drawn from a normal distribution (clamped at zero) and each
+    interaction fails independently with probability ``failure_rate``.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None,
+        frontmost_app: str = "Terminal",
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Initializes the fake backend.
+
+        Args:
+            latency: Mean simulated interaction latency in seconds.
+            latency_jitter: Standard deviation of the latency in seconds.
+            failure_rate: Probability in [0, 1] that an interaction fails.
+            seed: Seed for the random generator, for reproducible runs.
+            frontmost_app: Name reported by ``get_frontmost_app``.
+            sleep: Function used to wait out the simulated latency.
+
+        Raises:
+            ValueError: If a latency is negative or the failure rate is
+                outside [0, 1].
+        """
+        if latency < 0 or latency_jitter < 0:
+            raise ValueError("Latency values must be non-negative.")
+        if not 0.0 <= failure_rate <= 1.0:
+            raise ValueError("failure_rate must be between 0 and 1.")
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.failure_rate = failure_rate
+        self.frontmost_app = frontmost_app
+        self._rng = random.Random(seed)
+        self._sleep = sleep
+        self.caffeinated = False
+        self.interactions = 0
+        self.failures = 0
+        self.focus_cycles = 0
+        self.notifications: List[Tuple[str, str]] = []
+        self.last_frontmost_hint: Optional[str] = None
+
+    def start_caffeinate(self) -> bool:
+        """Marks sleep prevention as active."""
+        self.caffeinated = True
+        return True
+
+    def stop_caffeinate(self):
+        """Marks sleep prevention as inactive."""
+        self.caffeinated = False
+
+    def interact(self, targets: Sequence[Target], frontmost_app: Optional[str] = None):
+        """Simulates one focus-and-restore cycle serving ``targets``.
+
+        Each target draws its own latency and fails independently. The
+        frontmost app is recorded in ``last_frontmost_hint`` but not otherwise used.
+
+        Raises:
+            InteractionError: If any simulated target interaction fails.
+        """
+        self.focus_cycles += 1
+        self.last_frontmost_hint = frontmost_app
+        failures = {}
+        for target in targets:
+            delay = self._sample_latency()
+            if delay:
+                self._sleep(delay)
+            self.interactions += 1
+            if self.failure_rate and self._rng.random() < self.failure_rate:
+                self.failures += 1
+                failures[target.name] = "Simulated interaction failure"
+        if failures:
+            raise InteractionError(failures)
+
+    def notify(self, title: str, message: str):
+        """Records the notification instead of displaying it."""
+        self.notifications.append((title, message))
+        logger.debug(f"[FAKE] Notification: {title}: {message}")
+
+    def get_frontmost_app(self) -> str:
+        """Returns the configured frontmost application name."""
+        return self.frontmost_app
+
+    def _sample_latency(self) -> float:
+        """Draws a non-negative latency from the configured distribution."""
+        if not self.latency_jitter:
+            return self.latency
+        return max(0.0, self._rng.gauss(self.latency, self.latency_jitter))
@@ -0,0 +1,77 @@
+"""Frontmost application tracking for the chteams utility.
+
+The tracker samples the foreground application through the controller at a
+bounded rate and remembers the last few changes, so the engine can tell
+whether the user is switching between apps before it steals focus.
+"""
+import math
+from collections import deque
+from typing import Callable, Deque, List, Optional, Tuple
+
+DEFAULT_HISTORY = 10
+
+
+class FrontmostTracker:
+    """Caches frontmost-app samples on a caller-supplied clock in seconds."""
+
+    def __init__(
+        self,
+        probe: Callable[[], str],
+        min_interval: float = 1,
+        history: int = DEFAULT_HISTORY,
+    ):
+        """Initializes the tracker.
+
+        Args:
+            probe: Returns the current frontmost application name, typically
+                ``Controller.get_frontmost_app``.
+            min_interval: Seconds a sample stays fresh; ``sample`` reuses it
+                within this window unless forced.
+            history: Number of foreground changes to remember.
+        """
+        self._probe = probe
+        self.min_interval = min_interval
+        self.app = ""
+        self.samples = 0
+        self._sampled_at: Optional[float] = None
+        self._changes: Deque[Tuple[float, str]] = deque(maxlen=history)
+
+    @property
+    def history(self) -> List[Tuple[float, str]]:
+        """Returns the remembered (clock, app) changes, oldest first."""
+        return list(self._changes)
+
+    def sample(self, now: float, force: bool = False, max_age: Optional[float] = None) -> str:
+        """Returns the frontmost app, probing only when the cached sample is stale.
+
+        Args:
+            now: The current clock value.
+            force: Probe even if the cached sample is still fresh.
+            max_age: Seconds a cached sample may be reused for this call,
+                instead of ``min_interval``.
+
+        Returns:
+            str: The frontmost application name, or an empty string if unknown.
+        """
+        max_age = self.min_interval if max_age is None else max_age
+        fresh = self._sampled_at is not None and now - self._sampled_at < max_age
+        if fresh and not force:
+            return self.app
+        app = self._probe()
+        self.samples += 1
+        self._sampled_at = now
+        if app and app != self.app:
+            self._changes.append((now, app))
+        if app:
+            self.app = app
+        return self.app
+
+    def stable_for(self, now: float) -> float:
+        """Returns seconds since the foreground app last changed.
+
+        The first observed app counts as stable, since the time it was
+        brought to the front is unknown.
+        """
+        if len(self._changes) < 2:
+            return math.inf
+        return now - self._changes[-1][0]
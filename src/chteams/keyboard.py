@@ -0,0 +1,143 @@
+"""Non-blocking single-key terminal input for the chteams utility.
+
+Puts the terminal into cbreak mode so individual keystrokes are delivered
+immediately, and waits on them with a selector that can be woken up from
+another thread so the reader always stops cleanly.
+"""
+import logging
+import os
+import selectors
+import sys
+import termios
+import tty
+from contextlib import contextmanager
+from threading import Event, Lock, Thread
+from typing import Iterator, Optional, TextIO
+
+logger = logging.getLogger(__name__)
+
+PAUSE_KEYS = ("p",)
+ACT_NOW_KEYS = ("n",)
+QUIT_KEYS = ("q",)
+INTERVAL_UP_KEYS = ("+", "=")
+INTERVAL_DOWN_KEYS = ("-", "_")
+INTERVAL_STEP = 30
+
+
+@contextmanager
+def cbreak_terminal(fd: int) -> Iterator[None]:
+    """Switches a terminal to cbreak mode and restores it on exit.
+
+    cbreak mode disables line buffering and echo but keeps signal keys, so
+    Ctrl+C still raises KeyboardInterrupt in the main thread. Non-terminal
+    file descriptors are left untouched.
+
+    Args:
+        fd: The file descriptor of the terminal to configure.
+    """
+    if not os.isatty(fd):
+        yield
+        return
+    previous = termios.tcgetattr(fd)
+    try:
+        tty.setcbreak(fd)
+        yield
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, previous)
+
+
+class InputHandler(Thread):
+    """A dedicated thread that reacts to single keystrokes.
+
+    Keys are translated into events the engine polls: ``p`` toggles pause,
+    ``n`` forces an action now, ``q`` quits and ``+``/``-`` change the
+    interval by ``INTERVAL_STEP`` seconds. ``key_pressed`` is set after every
+    recognised key so a waiting engine can wake up and apply it at once.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        """Initializes the handler for ``stream`` (stdin by default)."""
+        super().__init__(name="chteams-input")
+        self.stream = stream if stream is not None else sys.stdin
+        self.pause_requested = Event()
+        self.act_now_requested = Event()
+        self.quit_requested = Event()
+        self.key_pressed = Event()
+        self.stopped = Event()
+        self._interval_delta = 0
+        self._lock = Lock()
+        self._wake_r, self._wake_w = os.pipe()
+        self._closed = False
+
+    def run(self):
+        """Reads keystrokes until stopped or the input stream is closed."""
+        try:
+            fd = self.stream.fileno()
+        except (AttributeError, OSError, ValueError):
+            logger.warning("Input stream has no file descriptor; keyboard controls disabled.")
+            return
+
+        with cbreak_terminal(fd), selectors.DefaultSelector() as selector:
+            try:
+                selector.register(fd, selectors.EVENT_READ)
+            except OSError:
+                # epoll rejects regular files such as /dev/null or redirected input
+                logger.warning("Input stream cannot be polled; keyboard controls disabled.")
+                return
+            selector.register(self._wake_r, selectors.EVENT_READ)
+            while not self.stopped.is_set():
+                for key, _ in selector.select():
+                    if key.fd == self._wake_r:
+                        return
+                    data = os.read(fd, 64)
+                    if not data:
+                        # stdin was closed
+                        return
+                    for char in data.decode(errors="ignore"):
+                        self._dispatch(char)
+
+    def _dispatch(self, char: str):
+        """Translates a single keystroke into the matching request."""
+        key = char.lower()
+        logger.debug(f"[INPUT THREAD] Received key: {key!r}")
+        if key in PAUSE_KEYS:
+            self.pause_requested.set()
+        elif key in ACT_NOW_KEYS:
+            self.act_now_requested.set()
+        elif key in QUIT_KEYS:
+            self.quit_requested.set()
+        elif key in INTERVAL_UP_KEYS:
+            with self._lock:
+                self._interval_delta += INTERVAL_STEP
+        elif key in INTERVAL_DOWN_KEYS:
+            with self._lock:
+                self._interval_delta -= INTERVAL_STEP
+        else:
+            return
+        self.key_pressed.set()
+
+    def take_interval_delta(self) -> int:
+        """Returns and resets the accumulated interval change in seconds."""
+        with self._lock:
+            delta, self._interval_delta = self._interval_delta, 0
+        return delta
+
+    def stop(self, timeout: float = 1.0):
+        """Wakes the reader, waits for it to exit and releases its resources.
+
+        Args:
+            timeout: Maximum seconds to wait for the thread to finish.
+        """
+        self.stopped.set()
+        if self._closed:
+            return
+        try:
+            os.write(self._wake_w, b"\0")
+        except OSError:
+            pass
+        if self.is_alive():
+            self.join(timeout)
+        if not self.is_alive():
+            os.close(self._wake_r)
+            os.close(self._wake_w)
+            self._closed = True
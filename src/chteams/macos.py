@@ -1,5 +1,7 @@
 import subprocess
 import logging
+from typing import Dict, Optional, Sequence
+from .targets import InteractionError, Target
 
 logger = logging.getLogger(__name__)
 
@@ -8,7 +10,7 @@ class MacOSController:
     """Handles macOS specific system commands for preventing sleep and simulating activity.
 
     This controller manages the 'caffeinate' process and executes AppleScripts to
-    interact with Microsoft Teams.
+    interact with Microsoft Teams and other registered targets.
     """
 
     def __init__(self):
@@ -35,42 +37,61 @@ class MacOSController:
             self._caffeinate_proc.terminate()
             logger.info("System 'caffeinate' deactivated.")
 
-    def focus_teams_and_interact(self):
-        """Brings Microsoft Teams to focus, simulates a keystroke, and returns focus.
+    def interact(self, targets: Sequence[Target], frontmost_app: Optional[str] = None):
+        """Runs the action of each target in a single focus-and-restore cycle.
 
-        Uses AppleScript to ensure Teams is the active application, triggers
-        the 'Activity' tab shortcut, and then activates the previously focused app.
+        The frontmost application is captured once, each target is activated
+        and its action script executed in turn, and focus is restored once at
+        the end, even if some targets fail. A target that is already frontmost
+        is served last, so activating it doubles as the focus restore unless it
+        fails; when it is the only target, no activation happens at all.
+
+        Args:
+            targets: The targets to interact with, in order.
+            frontmost_app: The known frontmost application, or None to look
+                it up.
 
         Raises:
-            RuntimeError: If the AppleScript execution fails.
+            InteractionError: If the AppleScript of any target fails.
         """
-        previous_app = self.get_frontmost_app()
-        logger.debug(f"Previous app was '{previous_app}'. Activating Teams.")
+        previous_app = self.get_frontmost_app() if frontmost_app is None else frontmost_app
+        logger.debug(f"Previous app was '{previous_app}'. Activating {len(targets)} target(s).")
+
+        in_front = [target for target in targets if target.app_name == previous_app]
+        others = [target for target in targets if target.app_name != previous_app]
 
-        script = """
-        tell application "Microsoft Teams"
+        failures = {}
+        for target in others:
+            self._run_action(target, failures, activate=True)
+        for target in in_front:
+            self._run_action(target, failures, activate=bool(others))
+
+        # Restore focus to the previous app, even if some interactions failed
+        restored = in_front and not any(target.name in failures for target in in_front)
+        if previous_app and others and not restored:
+            logger.debug(f"Restoring focus to '{previous_app}'.")
+            self.activate_app(previous_app)
+
+        if failures:
+            raise InteractionError(failures)
+
+    def _run_action(self, target: Target, failures: Dict[str, str], activate: bool):
+        """Runs the action script of ``target``, recording any failure by name."""
+        activation = f"""
+        tell application "{target.app_name}"
             activate
         end tell
-        delay 1
-        tell application "System Events"
-            keystroke "1" using {command down}
-        end tell
+        delay 1""" if activate else ""
+        script = f"""{activation}
+        {target.action_script}
         """
         try:
             subprocess.run(["osascript", "-e", script], capture_output=True, check=True)
-            logger.debug("Teams interaction successful.")
+            logger.debug(f"{target.app_name} interaction successful.")
         except subprocess.CalledProcessError as e:
             error_msg = e.stderr.decode().strip()
-            logger.error(f"AppleScript failed: {error_msg}")
-            # Still try to restore focus even if interaction fails
-            if previous_app and previous_app != "Microsoft Teams":
-                self.activate_app(previous_app)
-            raise RuntimeError(f"Failed to interact with Teams: {error_msg}")
-
-        # Restore focus to the previous app
-        if previous_app and previous_app != "Microsoft Teams":
-            logger.debug(f"Restoring focus to '{previous_app}'.")
-            self.activate_app(previous_app)
+            logger.error(f"AppleScript failed for {target.app_name}: {error_msg}")
+            failures[target.name] = error_msg
 
     def activate_app(self, app_name: str):
         """Activates a given application by name, with special handling for Warp."""
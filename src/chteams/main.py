@@ -1,13 +1,16 @@
 """Main entry point for the chteams utility.
 
-This module initializes logging and orchestrates the MacOSController and
-ActivityEngine to keep the system and Teams active.
+This module initializes logging and orchestrates the selected controller
+backend and ActivityEngine to keep the system and Teams active.
 """
 import logging
 import sys
 import argparse
-from .macos import MacOSController
-from .engine import ActivityEngine
+from .controller import BACKENDS, create_controller
+from .engine import MAX_DEFER, MIN_INTERVAL, SETTLE_SECONDS, ActivityEngine
+from .profiling import SessionProfiler
+from .scheduler import DEFAULT_MERGE_WINDOW
+from .targets import TARGETS, parse_targets
 from .ui import show_banner, show_summary
 
 logger = logging.getLogger(__name__)
@@ -35,13 +38,140 @@ def main():
     """
     parser = argparse.ArgumentParser(description="Microsoft Teams Anti-Away Utility")
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
+    parser.add_argument(
+        "--backend",
+        choices=sorted(BACKENDS),
+        default="macos",
+        help="Controller backend to use (default: macos)",
+    )
+    parser.add_argument(
+        "--interval",
+        type=int,
+        default=None,
+        help=(
+            "Seconds between activity simulations for every target "
+            f"(default: each target's own, 240 for Teams; minimum: {MIN_INTERVAL} "
+            "except with --backend fake)"
+        ),
+    )
+    parser.add_argument(
+        "--targets",
+        default=None,
+        help=(
+            "Comma separated apps to keep active, each at its own interval "
+            f"(available: {', '.join(sorted(TARGETS))}; default: teams)"
+        ),
+    )
+    parser.add_argument(
+        "--merge-window",
+        type=int,
+        default=DEFAULT_MERGE_WINDOW,
+        help=(
+            "Seconds within which upcoming targets share one focus cycle "
+            f"(default: {DEFAULT_MERGE_WINDOW})"
+        ),
+    )
+    parser.add_argument(
+        "--settle-seconds",
+        type=int,
+        default=SETTLE_SECONDS,
+        help=(
+            "Postpone an interaction until the frontmost app has been unchanged "
+            f"this long; 0 disables (default: {SETTLE_SECONDS})"
+        ),
+    )
+    parser.add_argument(
+        "--max-defer",
+        type=int,
+        default=MAX_DEFER,
+        help=f"Longest an interaction may be postponed in seconds (default: {MAX_DEFER})",
+    )
+    parser.add_argument(
+        "--fake-latency",
+        type=float,
+        default=0.0,
+        help="Mean interaction latency in seconds for the fake backend",
+    )
+    parser.add_argument(
+        "--fake-jitter",
+        type=float,
+        default=0.0,
+        help="Standard deviation of the fake backend latency in seconds",
+    )
+    parser.add_argument(
+        "--fake-failure-rate",
+        type=float,
+        default=0.0,
+        help="Probability that a fake backend interaction fails",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Random seed for the fake backend",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Sample engine cycles and track memory growth",
+    )
+    parser.add_argument(
+        "--profile-cycles",
+        type=int,
+        default=5,
+        help="Number of engine cycles to sample when profiling (default: 5)",
+    )
+    parser.add_argument(
+        "--profile-output",
+        default="chteams.collapsed",
+        help="Collapsed-stack output file for flamegraph tools",
+    )
     args = parser.parse_args()
+    if args.interval is not None and args.interval < 0:
+        parser.error("--interval must be non-negative")
+    if args.interval is not None and args.interval < MIN_INTERVAL and args.backend != "fake":
+        parser.error(f"--interval must be at least {MIN_INTERVAL}s unless --backend fake is used")
+    if args.merge_window < 0:
+        parser.error("--merge-window must be non-negative")
+    if args.settle_seconds < 0 or args.max_defer < 0:
+        parser.error("--settle-seconds and --max-defer must be non-negative")
+    targets = None
+    if args.targets is not None:
+        try:
+            targets = parse_targets(args.targets)
+        except ValueError as e:
+            parser.error(str(e))
 
     setup_logging(args.debug)
     show_banner()
 
-    controller = MacOSController()
-    engine = ActivityEngine(controller=controller, debug=args.debug)
+    options = {}
+    if args.backend == "fake":
+        options = {
+            "latency": args.fake_latency,
+            "latency_jitter": args.fake_jitter,
+            "failure_rate": args.fake_failure_rate,
+            "seed": args.seed,
+        }
+    try:
+        controller = create_controller(args.backend, **options)
+    except ValueError as e:
+        parser.error(str(e))
+    profiler = None
+    if args.profile:
+        profiler = SessionProfiler(
+            output_path=args.profile_output, cycles=args.profile_cycles
+        )
+    engine = ActivityEngine(
+        controller=controller,
+        interval=args.interval,
+        debug=args.debug,
+        profiler=profiler,
+        targets=targets,
+        merge_window=args.merge_window,
+        settle_seconds=args.settle_seconds,
+        max_defer=args.max_defer,
+    )
 
     try:
         uptime, count = engine.run()
@@ -0,0 +1,227 @@
+"""Built-in profiling and memory tracking for long-running sessions.
+
+Provides a low-overhead sampling profiler that records collapsed stacks
+(the ``frame;frame;frame count`` format read by flamegraph tools) of every
+thread for a fixed number of engine cycles, plus periodic tracemalloc
+snapshots that report RSS and allocation growth over the session.
+"""
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (file, function) of innermost frames where a thread is blocked rather than
+# working: event and condition waits (engine ticks, Rich's refresh thread),
+# selector polls (key reader, subprocess pipes) and child process waits.
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("selectors.py", "select"),
+    ("subprocess.py", "_try_wait"),
+}
+
+
+def _current_rss_kb() -> int:
+    """Returns the resident set size of the current process in kilobytes.
+
+    Reads ``/proc/self/statm``, so it is only available on platforms with
+    procfs (Linux).
+
+    Returns:
+        int: The RSS in kilobytes, or 0 if it could not be determined.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _peak_rss_kb() -> int:
+    """Returns the peak resident set size of the current process in kilobytes.
+
+    Returns:
+        int: The peak RSS in kilobytes, or 0 if it could not be determined.
+    """
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux.
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _rss_kb() -> Tuple[str, int]:
+    """Returns a (label, kilobytes) pair for the best available RSS figure.
+
+    Current RSS is used where procfs exists. Elsewhere (macOS) only the peak
+    is available, which never decreases, so it is labelled as such.
+    """
+    current = _current_rss_kb()
+    if current:
+        return "RSS", current
+    return "peak RSS", _peak_rss_kb()
+
+
+def _is_idle(frame) -> bool:
+    """Returns True if the innermost frame is a known blocking wait."""
+    code = frame.f_code
+    return (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES
+
+
+def _collapse_stack(frame, thread_name: str = "") -> str:
+    """Converts a frame into a semicolon separated, root-first stack string.
+
+    The stack is rooted at ``thread_name`` when one is given.
+    """
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    if thread_name:
+        parts.append(thread_name)
+    return ";".join(reversed(parts))
+
+
+class SessionProfiler:
+    """Samples engine cycles and tracks memory growth over a session.
+
+    The sampler thread runs from the start of the first ``cycle()`` block
+    until ``cycles`` cycles have completed, recording every thread (including
+    Rich's refresh thread) and skipping threads that are blocked in a wait.
+    Once the budget is spent the profiler costs nothing beyond tracemalloc
+    bookkeeping.
+    """
+
+    def __init__(
+        self,
+        output_path: str = "chteams.collapsed",
+        cycles: int = 5,
+        sample_interval: float = 0.01,
+        snapshot_every: int = 10,
+        top_stats: int = 5,
+    ):
+        """Initializes the profiler.
+
+        Args:
+            output_path: File the collapsed stacks are written to on stop.
+            cycles: Number of engine cycles to sample.
+            sample_interval: Seconds between stack samples while sampling.
+            snapshot_every: Take a tracemalloc snapshot every N cycles.
+            top_stats: Number of allocation sites to report per snapshot.
+        """
+        self.output_path = output_path
+        self.cycles = cycles
+        self.sample_interval = sample_interval
+        self.snapshot_every = snapshot_every
+        self.top_stats = top_stats
+        self.cycle_count = 0
+        self.samples: Counter = Counter()
+        self.baseline_rss_kb = 0
+        self._baseline_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._sampler: Optional[threading.Thread] = None
+        self._sampling = threading.Event()
+        self._started_tracemalloc = False
+
+    def start(self):
+        """Starts memory tracking and records the baseline snapshot."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._baseline_snapshot = tracemalloc.take_snapshot()
+        _, self.baseline_rss_kb = _rss_kb()
+        logger.info(
+            f"Profiling enabled: sampling {self.cycles} cycles, "
+            f"output to '{self.output_path}'."
+        )
+
+    def stop(self):
+        """Stops sampling, reports memory growth and writes the collapsed stacks."""
+        self._stop_sampler()
+        if self._baseline_snapshot is not None:
+            self.snapshot()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        self.write_collapsed()
+
+    @contextmanager
+    def cycle(self) -> Iterator[None]:
+        """Wraps one engine cycle, sampling until the cycle budget is spent."""
+        if self.cycle_count < self.cycles and self._sampler is None:
+            self._start_sampler()
+        try:
+            yield
+        finally:
+            self.cycle_count += 1
+            if self.cycle_count >= self.cycles:
+                self._stop_sampler()
+            if self.snapshot_every and self.cycle_count % self.snapshot_every == 0:
+                self.snapshot()
+
+    def snapshot(self):
+        """Logs current RSS and the top allocation growth since the baseline."""
+        label, rss_kb = _rss_kb()
+        logger.info(
+            f"[PROFILE] cycle {self.cycle_count}: {label} {rss_kb} KiB "
+            f"({rss_kb - self.baseline_rss_kb:+d} KiB since start)"
+        )
+        if self._baseline_snapshot is None or not tracemalloc.is_tracing():
+            return
+        # Hide the profiler's own bookkeeping so growth in the engine and UI stands out.
+        filters = [
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, tracemalloc.__file__),
+        ]
+        current = tracemalloc.take_snapshot().filter_traces(filters)
+        baseline = self._baseline_snapshot.filter_traces(filters)
+        for stat in current.compare_to(baseline, "lineno")[: self.top_stats]:
+            logger.info(f"[PROFILE]   {stat}")
+
+    def write_collapsed(self):
+        """Writes the sampled stacks to ``output_path`` in collapsed format."""
+        if not self.samples:
+            logger.info("No profile samples collected.")
+            return
+        try:
+            with open(self.output_path, "w") as out:
+                for stack, count in self.samples.most_common():
+                    out.write(f"{stack} {count}\n")
+            logger.info(f"Wrote {sum(self.samples.values())} samples to '{self.output_path}'.")
+        except OSError as e:
+            logger.error(f"Failed to write profile output: {e}")
+
+    def _start_sampler(self):
+        """Starts the background sampler thread."""
+        self._sampling.set()
+        self._sampler = threading.Thread(target=self._sample_loop, name="chteams-profiler", daemon=True)
+        self._sampler.start()
+
+    def _stop_sampler(self):
+        """Signals the sampler thread to stop and waits for it."""
+        self._sampling.clear()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+
+    def _sample_loop(self):
+        """Records the stack of every busy thread each ``sample_interval`` seconds."""
+        own_id = threading.get_ident()
+        while self._sampling.is_set():
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            frame = None
+            frames = sys._current_frames()
+            for thread_id, frame in frames.items():
+                if thread_id != own_id and not _is_idle(frame):
+                    self.samples[_collapse_stack(frame, names.get(thread_id, str(thread_id)))] += 1
+            del frames, frame
+            time.sleep(self.sample_interval)
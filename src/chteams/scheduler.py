@@ -0,0 +1,125 @@
+"""Timer-heap scheduler for multiple activity targets.
+
+Deadlines are kept in a heap so the next due target is found in O(log n).
+When a target comes due, every other target whose deadline falls within the
+merge window is served in the same cycle, so a single focus-and-restore round
+trip covers several applications.
+"""
+import heapq
+import itertools
+import math
+from dataclasses import replace
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .targets import Target
+
+DEFAULT_MERGE_WINDOW = 30
+
+
+class TargetScheduler:
+    """Schedules targets on a caller-supplied clock measured in seconds."""
+
+    def __init__(self, targets: Iterable[Target], merge_window: float = DEFAULT_MERGE_WINDOW, now: float = 0):
+        """Initializes the scheduler with every target due at ``now``.
+
+        Args:
+            targets: The targets to schedule; names must be unique.
+            merge_window: Seconds ahead of ``now`` within which pending
+                deadlines are merged into a due cycle.
+            now: The current clock value.
+        """
+        self.merge_window = merge_window
+        self.targets: Dict[str, Target] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._live: Dict[str, int] = {}
+        self._deadlines: Dict[str, float] = {}
+        self._counter = itertools.count()
+        for target in targets:
+            self.targets[target.name] = target
+            self._push(target.name, now)
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    def _push(self, name: str, deadline: float):
+        """Schedules ``name`` at ``deadline``, superseding earlier entries."""
+        seq = next(self._counter)
+        self._live[name] = seq
+        self._deadlines[name] = deadline
+        heapq.heappush(self._heap, (deadline, seq, name))
+
+    def _discard_stale(self):
+        """Drops heap entries that were superseded or removed."""
+        while self._heap and self._live.get(self._heap[0][2]) != self._heap[0][1]:
+            heapq.heappop(self._heap)
+
+    def next_deadline(self, name: Optional[str] = None) -> Optional[float]:
+        """Returns the deadline of ``name``, or the earliest deadline overall."""
+        if name is not None:
+            return self._deadlines.get(name)
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def seconds_until_next(self, now: float) -> int:
+        """Returns whole seconds until the earliest deadline (0 if overdue or empty)."""
+        deadline = self.next_deadline()
+        if deadline is None:
+            return 0
+        return max(0, math.ceil(deadline - now))
+
+    def peek_due(self, now: float) -> List[Target]:
+        """Returns the targets ``pop_due`` would serve at ``now``, without removing them."""
+        deadline = self.next_deadline()
+        if deadline is None or deadline > now:
+            return []
+        due = sorted(self._deadlines.items(), key=lambda item: item[1])
+        return [self.targets[name] for name, at in due if at <= now + self.merge_window]
+
+    def pop_due(self, now: float) -> List[Target]:
+        """Removes and returns the targets to serve in this cycle.
+
+        Nothing is returned until at least one deadline has passed; then all
+        targets due within ``merge_window`` seconds are returned together.
+        """
+        self._discard_stale()
+        if not self._heap or self._heap[0][0] > now:
+            return []
+        due = []
+        while self._heap and self._heap[0][0] <= now + self.merge_window:
+            _, seq, name = heapq.heappop(self._heap)
+            if self._live.get(name) == seq:
+                del self._live[name]
+                del self._deadlines[name]
+                due.append(self.targets[name])
+        return due
+
+    def pop_all(self) -> List[Target]:
+        """Removes and returns every scheduled target, regardless of deadline."""
+        due = [self.targets[name] for name in self._live]
+        self._live.clear()
+        self._deadlines.clear()
+        self._heap.clear()
+        return due
+
+    def reschedule(self, targets: Iterable[Target], now: float):
+        """Schedules each target one interval after ``now``."""
+        for target in targets:
+            if target.name in self.targets:
+                self._push(target.name, now + self.targets[target.name].interval)
+
+    def remove(self, name: str):
+        """Stops scheduling the target called ``name``."""
+        self.targets.pop(name, None)
+        self._live.pop(name, None)
+        self._deadlines.pop(name, None)
+
+    def adjust_intervals(self, delta: int, minimum: int = 0):
+        """Shifts every target interval by ``delta`` seconds, clamped at ``minimum``.
+
+        An interval that is already below ``minimum`` (e.g. a fake backend
+        load test) is never raised by a decrease. Existing deadlines are kept;
+        new intervals apply from the next reschedule.
+        """
+        for name, target in self.targets.items():
+            interval = max(min(minimum, target.interval), target.interval + delta)
+            self.targets[name] = replace(target, interval=interval)
@@ -0,0 +1,104 @@
+"""Activity targets for the chteams utility.
+
+A target describes one chat application to keep active: the application to
+focus, the AppleScript to run once it is frontmost and how often to do so.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Mapping
+
+
+@dataclass(frozen=True)
+class Target:
+    """An application kept active by the engine.
+
+    Attributes:
+        name: Short unique identifier used on the CLI and dashboard.
+        app_name: Application name passed to ``tell application``.
+        action_script: AppleScript run after the application is activated.
+        interval: Seconds between interactions with this target.
+    """
+
+    name: str
+    app_name: str
+    action_script: str
+    interval: int = 240
+
+
+@dataclass
+class TargetStatus:
+    """Mutable per-target state reported on the dashboard.
+
+    Attributes:
+        status: Outcome of the latest interaction.
+        last_action: Timestamp of the latest successful interaction.
+        interactions: Number of successful interactions.
+        consecutive_failures: Failures since the last success.
+    """
+
+    status: str = "Pending"
+    last_action: str = "Never"
+    interactions: int = 0
+    consecutive_failures: int = 0
+
+
+class InteractionError(RuntimeError):
+    """Raised when one or more targets fail during an interaction cycle.
+
+    Attributes:
+        failures: Error messages keyed by target name.
+    """
+
+    def __init__(self, failures: Mapping[str, str]):
+        """Initializes the error with the per-target failure messages."""
+        self.failures: Dict[str, str] = dict(failures)
+        details = "; ".join(f"{name}: {msg}" for name, msg in self.failures.items())
+        super().__init__(f"Failed to interact with {details}")
+
+
+TEAMS = Target(
+    name="teams",
+    app_name="Microsoft Teams",
+    action_script="""
+        tell application "System Events"
+            keystroke "1" using {command down}
+        end tell
+        """,
+    interval=240,
+)
+
+SLACK = Target(
+    name="slack",
+    app_name="Slack",
+    action_script="""
+        tell application "System Events"
+            keystroke "m" using {command down, shift down}
+        end tell
+        """,
+    interval=300,
+)
+
+TARGETS: Dict[str, Target] = {target.name: target for target in (TEAMS, SLACK)}
+
+
+def parse_targets(value: str) -> List[Target]:
+    """Parses a comma separated list of registered target names.
+
+    Args:
+        value: Names such as ``"teams,slack"``.
+
+    Returns:
+        List[Target]: The matching targets, in the given order.
+
+    Raises:
+        ValueError: If a name is not registered or the list is empty.
+    """
+    names = [name.strip().lower() for name in value.split(",") if name.strip()]
+    if not names:
+        raise ValueError("At least one target is required.")
+    unknown = [name for name in names if name not in TARGETS]
+    if unknown:
+        raise ValueError(
+            f"Unknown target(s): {', '.join(unknown)}. "
+            f"Available: {', '.join(sorted(TARGETS))}"
+        )
+    return [TARGETS[name] for name in dict.fromkeys(names)]
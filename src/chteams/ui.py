@@ -1,6 +1,7 @@
 """UI components for the chteams utility using the rich library."""
 
 from datetime import datetime
+from typing import Optional, Sequence, Tuple
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
@@ -21,11 +22,27 @@ BANNER = r"""
            [italic blue]Microsoft Teams Anti-Away Utility[/italic blue]
 """
 
+TARGET_STATUS_COLORS = {
+    "OK": "green",
+    "Pending": "dim",
+    "Failed": "bold red",
+    "Disabled": "red",
+}
+
 def show_banner():
     """Displays the CHTEAMS ASCII banner."""
     console.print(BANNER)
 
-def create_dashboard(status: str, uptime: str, last_act: str, next_act: str, interval: int, message: str = "") -> Panel:
+def create_dashboard(
+    status: str,
+    uptime: str,
+    last_act: str,
+    next_act: str,
+    interval: Optional[int],
+    message: str = "",
+    targets: Optional[Sequence[Tuple[str, str, str, str, str]]] = None,
+    focus: Optional[Tuple[int, int]] = None,
+) -> Panel:
     """Creates a dashboard panel with status information.
 
     Args:
@@ -33,8 +50,13 @@ def create_dashboard(status: str, uptime: str, last_act: str, next_act: str, int
         uptime: Formatted uptime string.
         last_act: Timestamp of the last interaction.
         next_act: Formatted time until next action.
-        interval: Configured interval in seconds.
+        interval: Configured interval in seconds, or None when each target
+            row shows its own interval.
         message: Optional message to display in the dashboard.
+        targets: Optional (app, status, last action, next action, interval)
+            rows, one per activity target.
+        focus: Optional (deferred, skipped) counts of postponed interactions
+            and focus round trips skipped because a target was frontmost.
 
     Returns:
         Panel: A rich Panel object containing the dashboard.
@@ -55,7 +77,21 @@ def create_dashboard(status: str, uptime: str, last_act: str, next_act: str, int
     table.add_row("Uptime: ", uptime)
     table.add_row("Last Action: ", last_act)
     table.add_row("Next Action in: ", f"[bold yellow]{next_act}[/bold yellow]")
-    table.add_row("Interval: ", f"{interval}s")
+    if interval is not None:
+        table.add_row("Interval: ", f"{interval}s")
+    if focus is not None:
+        deferred, skipped = focus
+        table.add_row("Focus: ", f"Deferred {deferred} | Skipped {skipped}")
+
+    if targets:
+        table.add_row("", "") # Spacer
+        for app_name, target_status, target_last, target_next, target_interval in targets:
+            color = TARGET_STATUS_COLORS.get(target_status, "white")
+            table.add_row(
+                f"{app_name}: ",
+                f"[{color}]{target_status}[/{color}] | Last: {target_last} | "
+                f"Next: {target_next} | Every: {target_interval}",
+            )
     
     if message:
         table.add_row("", "") # Spacer
@@ -65,7 +101,7 @@ def create_dashboard(status: str, uptime: str, last_act: str, next_act: str, int
         table,
         title="[bold white]Activity Dashboard[/bold white]",
         border_style="purple",
-        subtitle="[dim]p + Enter: Pause/Resume | Ctrl+C: Exit[/dim]"
+        subtitle="[dim]p: Pause/Resume | n: Act Now | +/-: Interval | q: Exit[/dim]"
     )
 
 def show_summary(uptime: str, total_actions: int):
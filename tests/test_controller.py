@@ -0,0 +1,26 @@
+"""Tests for the controller protocol and backend registry."""
+
+import pytest
+from chteams.controller import BACKENDS, Controller, create_controller
+from chteams.fake import FakeController
+from chteams.macos import MacOSController
+
+
+def test_backends_implement_protocol():
+    """Verifies that every registered backend satisfies the Controller protocol."""
+    for factory in BACKENDS.values():
+        assert isinstance(factory(), Controller)
+
+
+def test_create_controller_by_name():
+    """Verifies that backends are created by name with forwarded options."""
+    assert isinstance(create_controller("macos"), MacOSController)
+    fake = create_controller("fake", failure_rate=1.0)
+    assert isinstance(fake, FakeController)
+    assert fake.failure_rate == 1.0
+
+
+def test_create_controller_unknown_backend():
+    """Verifies that an unknown backend name raises ValueError."""
+    with pytest.raises(ValueError, match="Unknown controller backend"):
+        create_controller("windows")
@@ -1,12 +1,27 @@
+from contextlib import contextmanager
 from unittest.mock import MagicMock, patch
+import pytest
 from chteams.engine import ActivityEngine
+from chteams.ui import create_dashboard
+from chteams.fake import FakeController
+from chteams.targets import SLACK, TEAMS, InteractionError
+
+
+def _quiet_input(handler):
+    """Configures a mocked InputHandler so that no key requests are pending."""
+    handler.pause_requested.is_set.return_value = False
+    handler.act_now_requested.is_set.return_value = False
+    handler.quit_requested.is_set.return_value = False
+    handler.take_interval_delta.return_value = 0
+    handler.key_pressed.wait.return_value = False
+    return handler
 
 
 def test_engine_initialization():
     """Tests that the engine initializes correctly."""
     mock_controller = MagicMock()
     engine = ActivityEngine(controller=mock_controller, interval=100, debug=True)
-    assert engine.interval == 100
+    assert engine.scheduler.targets["teams"].interval == 100
     assert engine.debug is True
     assert engine.paused is False
 
@@ -20,7 +35,7 @@ def test_handle_input_pauses_engine(mock_input_handler_class):
     engine = ActivityEngine(controller=mock_controller)
     
     # Ensure is_set returns False by default so it doesn't toggle immediately
-    engine.input_handler.pause_requested.is_set.return_value = False
+    _quiet_input(engine.input_handler)
     
     # Verify starting state
     assert engine.paused is False
@@ -53,10 +68,9 @@ def test_run_loop_calls_handle_input(mock_input_handler_class, mock_handle_input
     def stop_engine(*args, **kwargs):
         engine.is_running = False
         
-    mock_controller.focus_teams_and_interact.side_effect = stop_engine
+    mock_controller.interact.side_effect = stop_engine
 
-    with patch("time.sleep", return_value=None):
-        engine.run()
+    engine.run()
 
     # The loop should run once, calling _handle_input at least once.
     assert mock_handle_input.call_count >= 1
@@ -66,21 +80,334 @@ def test_run_loop_calls_handle_input(mock_input_handler_class, mock_handle_input
 def test_engine_shuts_down_after_max_failures(mock_input_handler_class):
     """Tests that the engine stops after 3 consecutive interaction failures."""
     mock_controller = MagicMock()
-    mock_handler = MagicMock()
     # IMPORTANT: Ensure is_set() returns False so it doesn't enter PAUSED state
-    mock_handler.pause_requested.is_set.return_value = False
+    mock_handler = _quiet_input(MagicMock())
     mock_input_handler_class.return_value = mock_handler
     
     engine = ActivityEngine(controller=mock_controller, interval=1)
     
     # Always fail
-    mock_controller.focus_teams_and_interact.side_effect = RuntimeError("Persistent failure")
+    mock_controller.interact.side_effect = RuntimeError("Persistent failure")
 
-    with patch("time.sleep", return_value=None), \
-         patch("chteams.engine.Live"):
+    with patch("chteams.engine.Live"):
         engine.run()
 
     # Should have attempted 3 times (max_failures) and then stopped
-    assert mock_controller.focus_teams_and_interact.call_count == 3
+    assert mock_controller.interact.call_count == 3
     assert not engine.is_running
     assert mock_controller.notify.call_count == 4  # 3 failures + 1 shutdown notification
+
+
+@patch("chteams.engine.InputHandler")
+def test_run_wraps_cycles_with_profiler(mock_input_handler_class):
+    """Tests that the profiler is started, given each cycle and stopped."""
+    mock_controller = MagicMock()
+    mock_profiler = MagicMock()
+    engine = ActivityEngine(controller=mock_controller, interval=1, debug=True, profiler=mock_profiler)
+    _quiet_input(engine.input_handler)
+
+    def stop_engine(*args, **kwargs):
+        engine.is_running = False
+
+    mock_controller.interact.side_effect = stop_engine
+
+    engine.run()
+
+    mock_profiler.start.assert_called_once()
+    mock_profiler.cycle.assert_called_once()
+    mock_profiler.stop.assert_called_once()
+
+
+@patch("chteams.engine.InputHandler")
+def test_run_stops_input_reader_when_startup_fails(mock_input_handler_class):
+    """Tests that the reader thread is stopped if a later startup step raises."""
+    mock_profiler = MagicMock()
+    mock_profiler.start.side_effect = RuntimeError("tracemalloc unavailable")
+    engine = ActivityEngine(controller=MagicMock(), debug=True, profiler=mock_profiler)
+
+    with pytest.raises(RuntimeError):
+        engine.run()
+
+    engine.input_handler.start.assert_called_once()
+    engine.input_handler.stop.assert_called_once()
+    engine.controller.stop_caffeinate.assert_called_once()
+
+
+@patch("chteams.engine.InputHandler")
+def test_profiled_cycle_excludes_idle_wait(mock_input_handler_class):
+    """Tests that the wait for the next deadline runs outside the profiled block."""
+    inside = []
+
+    @contextmanager
+    def cycle():
+        inside.append(True)
+        yield
+        inside.pop()
+
+    mock_profiler = MagicMock()
+    mock_profiler.cycle.side_effect = cycle
+    engine = ActivityEngine(controller=MagicMock(), interval=60, debug=True, profiler=mock_profiler)
+    _quiet_input(engine.input_handler)
+    waits = []
+
+    def wait(*args, **kwargs):
+        waits.append(bool(inside))
+        engine.is_running = False
+
+    with patch.object(engine, "_wait_for_next", side_effect=wait):
+        engine.run()
+
+    assert waits == [False]
+
+
+@patch("chteams.engine.InputHandler")
+def test_handle_input_act_now_quit_and_interval(mock_input_handler_class):
+    """Tests that act-now, quit and interval requests are applied to the engine."""
+    engine = ActivityEngine(controller=MagicMock(), interval=60)
+    handler = _quiet_input(engine.input_handler)
+    engine.is_running = True
+
+    handler.act_now_requested.is_set.return_value = True
+    handler.take_interval_delta.return_value = 30
+    engine._handle_input()
+    assert engine.act_now is True
+    assert engine.scheduler.targets["teams"].interval == 90
+    handler.act_now_requested.clear.assert_called_once()
+
+    handler.take_interval_delta.return_value = -300
+    engine._handle_input()
+    assert engine.scheduler.targets["teams"].interval == 30  # Clamped to the minimum interval
+
+    handler.quit_requested.is_set.return_value = True
+    engine._handle_input()
+    assert engine.is_running is False
+
+
+@patch("chteams.engine.InputHandler")
+def test_engine_merges_targets_into_one_cycle(mock_input_handler_class):
+    """Tests that targets due together are served by a single controller call."""
+    controller = FakeController()
+    engine = ActivityEngine(controller=controller, debug=True, targets=[TEAMS, SLACK], merge_window=60)
+    _quiet_input(engine.input_handler)
+    engine.is_running = True
+
+    failures = engine._interact(engine._due_targets())
+
+    assert failures == {}
+    assert controller.focus_cycles == 1
+    assert controller.interactions == 2
+    assert engine.activity_count == 2
+    assert engine.scheduler.next_deadline("slack") == SLACK.interval
+    rows = engine._target_rows()
+    assert [row[:2] for row in rows] == [("Microsoft Teams", "OK"), ("Slack", "OK")]
+
+
+@patch("chteams.engine.InputHandler")
+def test_explicit_interval_applies_to_every_target(mock_input_handler_class):
+    """Tests that an explicit interval overrides the own interval of each target."""
+    engine = ActivityEngine(controller=MagicMock(), interval=60, targets=[TEAMS, SLACK])
+    assert [row[4] for row in engine._target_rows()] == ["60s", "60s"]
+    assert engine._describe_intervals() == "60s"
+
+    engine = ActivityEngine(controller=MagicMock(), targets=[TEAMS, SLACK])
+    assert engine._describe_intervals() == "Microsoft Teams 240s, Slack 300s"
+
+
+@patch("chteams.engine.InputHandler")
+def test_paused_engine_waits_until_resumed(mock_input_handler_class):
+    """Tests that an overdue paused engine holds in one wait instead of cycling every second."""
+    engine = ActivityEngine(controller=MagicMock(), debug=True)
+    handler = _quiet_input(engine.input_handler)
+    engine.is_running = True
+    engine.paused = True
+    handler.pause_requested.is_set.side_effect = [False, False, True, False]
+
+    with patch("chteams.engine.logger") as mock_logger:
+        engine._wait_for_next()
+
+    assert engine.paused is False
+    assert handler.key_pressed.wait.call_count == 3
+    mock_logger.info.assert_any_call("Waiting until the engine is resumed...")
+
+
+@patch("chteams.engine.InputHandler")
+def test_keystroke_wakes_wait_without_advancing_clock(mock_input_handler_class):
+    """Tests that a key is applied mid-tick and the clock only counts full seconds."""
+    engine = ActivityEngine(controller=MagicMock(), interval=60, debug=True)
+    handler = _quiet_input(engine.input_handler)
+    engine.is_running = True
+    engine.scheduler.reschedule(engine.scheduler.pop_all(), 0)
+    handler.key_pressed.wait.side_effect = [False, True]
+    handler.quit_requested.is_set.side_effect = [False, False, True]
+
+    engine._wait_for_next()
+
+    assert engine.is_running is False
+    assert engine._clock == 1
+    handler.key_pressed.clear.assert_called_once()
+
+
+@patch("chteams.engine.InputHandler")
+def test_engine_disables_only_failing_target(mock_input_handler_class):
+    """Tests that a persistently failing target is dropped while others keep running."""
+    controller = MagicMock()
+    controller.interact.side_effect = InteractionError({"slack": "not installed"})
+    engine = ActivityEngine(controller=controller, debug=True, targets=[TEAMS, SLACK])
+    engine.is_running = True
+
+    for _ in range(3):
+        engine._handle_failures(engine._interact([TEAMS, SLACK]))
+
+    assert engine.is_running is True
+    assert engine.target_status["slack"].status == "Disabled"
+    assert engine.target_status["teams"].interactions == 3
+    assert len(engine.scheduler) == 1
+
+
+@patch("chteams.engine.InputHandler")
+def test_engine_defers_while_frontmost_app_changes(mock_input_handler_class):
+    """Tests that a due interaction waits for the foreground app to settle."""
+    controller = FakeController()
+    engine = ActivityEngine(controller=controller, debug=True, settle_seconds=3, max_defer=10)
+    engine.frontmost.sample(0)
+    controller.frontmost_app = "Safari"
+    engine._clock = 1
+
+    assert engine._due_targets() == []
+    assert engine.deferred_count == 1
+    engine._clock = 3
+    assert engine._due_targets() == []
+    assert engine.deferred_count == 1  # Still the same deferral
+    engine._clock = 4
+    assert engine._due_targets() == [TEAMS]
+
+
+@patch("chteams.engine.InputHandler")
+def test_engine_stops_deferring_after_max_defer(mock_input_handler_class):
+    """Tests that deferral is bounded even if the user keeps switching apps."""
+    apps = iter(["Terminal", "Safari", "Mail", "Notes"])
+    controller = MagicMock()
+    controller.get_frontmost_app.side_effect = lambda: next(apps)
+    engine = ActivityEngine(controller=controller, debug=True, settle_seconds=5, max_defer=2)
+    engine.frontmost.sample(0)
+
+    for clock in (1, 2):
+        engine._clock = clock
+        assert engine._due_targets() == []
+    engine._clock = 3
+    assert engine._due_targets() == [TEAMS]
+
+
+@patch("chteams.engine.InputHandler")
+def test_engine_skips_focus_when_target_is_frontmost(mock_input_handler_class):
+    """Tests that a frontmost target is served without deferral and counted as skipped."""
+    controller = FakeController(frontmost_app="Microsoft Teams")
+    engine = ActivityEngine(controller=controller, debug=True)
+    engine.frontmost.sample(0)
+    controller.frontmost_app = "Slack"
+    engine.frontmost.sample(1)
+    controller.frontmost_app = "Microsoft Teams"
+    engine._clock = 2
+
+    engine._interact(engine._due_targets())
+
+    assert engine.deferred_count == 0
+    assert engine.focus_skips == 1
+    assert controller.last_frontmost_hint == "Microsoft Teams"
+
+
+@patch("chteams.engine.InputHandler")
+def test_engine_defers_when_other_target_is_frontmost(mock_input_handler_class):
+    """Tests that a frontmost target only skips deferral when it is itself due."""
+    controller = FakeController(frontmost_app="Terminal")
+    engine = ActivityEngine(controller=controller, debug=True, targets=[TEAMS, SLACK], merge_window=0)
+    engine.scheduler.reschedule(engine.scheduler.pop_all(), 0)
+    engine.frontmost.sample(0)
+    controller.frontmost_app = "Slack"
+    engine._clock = TEAMS.interval
+
+    assert engine._due_targets() == []
+    assert engine.deferred_count == 1
+    assert engine.scheduler.next_deadline("teams") == TEAMS.interval
+
+
+@patch("chteams.engine.InputHandler")
+def test_act_now_resets_pending_deferral(mock_input_handler_class):
+    """Tests that an interrupted deferral does not shorten the next one."""
+    controller = FakeController()
+    engine = ActivityEngine(controller=controller, debug=True, settle_seconds=3, max_defer=10)
+    engine.frontmost.sample(0)
+    controller.frontmost_app = "Safari"
+    engine._clock = 1
+    assert engine._due_targets() == []
+    assert engine.deferred_count == 1
+
+    engine.act_now = True
+    engine._interact(engine._due_targets())
+
+    controller.frontmost_app = "Mail"
+    engine._clock = 1 + TEAMS.interval
+    assert engine._due_targets() == []
+    assert engine.deferred_count == 2
+
+
+@patch("chteams.engine.InputHandler")
+def test_engine_load_with_fake_backend(mock_input_handler_class):
+    """Drives the engine through many zero-interval cycles with the fake backend."""
+    _quiet_input(mock_input_handler_class.return_value)
+    controller = FakeController(failure_rate=0.1, seed=3)
+    engine = ActivityEngine(controller=controller, interval=0, debug=True)
+    original = controller.interact
+
+    def interact(targets, **kwargs):
+        if controller.interactions >= 5000:
+            engine.stop()
+        original(targets, **kwargs)
+
+    controller.interact = interact
+    engine.run()
+
+    assert controller.interactions == 5001
+    assert engine.activity_count == controller.interactions - controller.failures
+    assert controller.caffeinated is False
+
+
+@patch("chteams.engine.Live")
+@patch("chteams.engine.InputHandler")
+def test_live_mode_refreshes_dashboard_without_waits(mock_input_handler_class, mock_live_class):
+    """Tests that zero-interval cycles with the fake backend still update the dashboard."""
+    _quiet_input(mock_input_handler_class.return_value)
+    controller = FakeController(seed=1)
+    engine = ActivityEngine(controller=controller, interval=0)
+    original = controller.interact
+
+    def interact(targets, frontmost_app=None):
+        if controller.interactions >= 100:
+            engine.stop()
+        original(targets, frontmost_app)
+
+    controller.interact = interact
+    with patch("chteams.engine.create_dashboard", wraps=create_dashboard) as mock_dashboard:
+        engine.run()
+
+    live = mock_live_class.return_value.__enter__.return_value
+    running = [call.args[0] for call in mock_dashboard.call_args_list if call.args[3] != "Stopped"]
+    assert "Simulating Activity" in running
+    assert live.update.call_count < controller.interactions  # Throttled
+
+
+@patch("chteams.engine.InputHandler")
+def test_frontmost_is_probed_twice_per_cycle(mock_input_handler_class):
+    """Tests that a wait and deadline check cost two frontmost probes, reused by the interaction."""
+    controller = MagicMock()
+    controller.get_frontmost_app.return_value = "Terminal"
+    engine = ActivityEngine(controller=controller, interval=60, debug=True)
+    _quiet_input(engine.input_handler)
+    engine.is_running = True
+    engine.scheduler.reschedule(engine.scheduler.pop_all(), 0)
+
+    engine._wait_for_next()
+    engine._interact(engine._due_targets())
+
+    assert engine._clock == 60
+    assert controller.get_frontmost_app.call_count == 2
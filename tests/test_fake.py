@@ -0,0 +1,60 @@
+"""Tests for the in-process fake controller."""
+
+from unittest.mock import MagicMock
+import pytest
+from chteams.fake import FakeController
+from chteams.targets import TEAMS, InteractionError
+
+
+def test_fake_records_interactions_and_notifications():
+    """Verifies that the fake backend keeps counters instead of touching the OS."""
+    controller = FakeController()
+    assert controller.start_caffeinate() is True
+    controller.interact([TEAMS])
+    controller.notify("Title", "Body")
+    controller.stop_caffeinate()
+
+    assert controller.interactions == 1
+    assert controller.failures == 0
+    assert controller.notifications == [("Title", "Body")]
+    assert controller.caffeinated is False
+    assert controller.get_frontmost_app() == "Terminal"
+
+
+def test_fake_failure_rate_is_seeded():
+    """Verifies that failures follow the configured rate reproducibly."""
+    def run(seed):
+        controller = FakeController(failure_rate=0.3, seed=seed)
+        outcomes = []
+        for _ in range(1000):
+            try:
+                controller.interact([TEAMS])
+                outcomes.append(True)
+            except InteractionError:
+                outcomes.append(False)
+        return controller, outcomes
+
+    first, outcomes = run(42)
+    _, repeat = run(42)
+    assert outcomes == repeat
+    assert 200 < first.failures < 400
+
+
+def test_fake_latency_uses_sleep_function():
+    """Verifies that sampled latency is non-negative and passed to sleep."""
+    sleep = MagicMock()
+    controller = FakeController(latency=0.01, latency_jitter=0.05, seed=1, sleep=sleep)
+    for _ in range(100):
+        controller.interact([TEAMS])
+    delays = [call.args[0] for call in sleep.call_args_list]
+    assert delays
+    assert all(delay > 0 for delay in delays)
+
+
+def test_fake_rejects_invalid_distributions():
+    """Verifies that invalid latency or failure settings are rejected."""
+    with pytest.raises(ValueError):
+        FakeController(latency=-1)
+    with pytest.raises(ValueError):
+        FakeController(failure_rate=1.5)
+
@@ -0,0 +1,45 @@
+"""Tests for the frontmost application tracker."""
+
+import math
+from unittest.mock import MagicMock
+from chteams.frontmost import FrontmostTracker
+
+
+def test_sample_is_cached_within_min_interval():
+    """Verifies that fresh samples are reused unless forced."""
+    probe = MagicMock(return_value="Terminal")
+    tracker = FrontmostTracker(probe, min_interval=2)
+
+    assert tracker.sample(0) == "Terminal"
+    assert tracker.sample(1) == "Terminal"
+    assert probe.call_count == 1
+    tracker.sample(1, force=True)
+    tracker.sample(3)
+    assert probe.call_count == 3
+    assert tracker.samples == 3
+
+
+def test_history_and_stability():
+    """Verifies that only app changes are remembered and timed."""
+    probe = MagicMock(side_effect=["Terminal", "Terminal", "Safari", "", "Slack"])
+    tracker = FrontmostTracker(probe, history=2)
+
+    tracker.sample(0)
+    assert tracker.stable_for(100) == math.inf  # First app has no known start
+    tracker.sample(1)
+    tracker.sample(2)
+    assert tracker.stable_for(5) == 3
+    assert tracker.sample(3) == "Safari"  # Failed probes keep the last app
+    tracker.sample(4)
+    assert tracker.history == [(2, "Safari"), (4, "Slack")]
+
+
+def test_max_age_extends_cached_sample():
+    """Verifies that a caller can reuse a sample for longer than min_interval."""
+    probe = MagicMock(return_value="Terminal")
+    tracker = FrontmostTracker(probe)
+    tracker.sample(0)
+    tracker.sample(4, max_age=5)
+    assert probe.call_count == 1
+    tracker.sample(5, max_age=5)
+    assert probe.call_count == 2
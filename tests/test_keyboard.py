@@ -0,0 +1,112 @@
+"""Tests for the single-key input handler of the chteams utility."""
+
+import logging
+import os
+import pty
+import termios
+import time
+from chteams.keyboard import InputHandler, INTERVAL_STEP
+
+
+class _Stream:
+    """Minimal stream exposing only a file descriptor."""
+
+    def __init__(self, fd):
+        self._fd = fd
+
+    def fileno(self):
+        return self._fd
+
+
+def _open_handler():
+    master, slave = pty.openpty()
+    handler = InputHandler(stream=_Stream(slave))
+    return master, slave, handler
+
+
+def _wait_for_cbreak(fd, original):
+    """Waits until the reader has switched the terminal out of canonical mode."""
+    deadline = time.monotonic() + 2
+    while termios.tcgetattr(fd) == original and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_single_keys_are_dispatched_without_enter():
+    """Verifies that keystrokes on a pty are handled immediately."""
+    master, slave, handler = _open_handler()
+    original = termios.tcgetattr(slave)
+    try:
+        handler.start()
+        _wait_for_cbreak(slave, original)
+        os.write(master, b"pnq")
+        for event in (handler.pause_requested, handler.act_now_requested, handler.quit_requested):
+            assert event.wait(2)
+        assert handler.key_pressed.is_set()
+        os.write(master, b"++-")
+        deadline = time.monotonic() + 2
+        delta = 0
+        while delta == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+            delta = handler.take_interval_delta()
+        assert delta == INTERVAL_STEP
+    finally:
+        handler.stop()
+        os.close(master)
+        os.close(slave)
+
+
+def test_stop_joins_thread_and_restores_terminal():
+    """Verifies that stop() ends the reader and restores the terminal mode."""
+    master, slave, handler = _open_handler()
+    original = termios.tcgetattr(slave)
+    try:
+        handler.start()
+        _wait_for_cbreak(slave, original)
+        assert termios.tcgetattr(slave) != original
+
+        handler.stop()
+        assert not handler.is_alive()
+        assert not handler.daemon
+        assert termios.tcgetattr(slave) == original
+    finally:
+        os.close(master)
+        os.close(slave)
+
+
+def test_stop_without_start_releases_resources():
+    """Verifies that a handler that never started can be stopped safely."""
+    handler = InputHandler(stream=_Stream(0))
+    handler.stop()
+    handler.stop()
+    assert handler.stopped.is_set()
+
+
+def test_closed_input_ends_thread():
+    """Verifies that the reader exits when its input reaches end of file."""
+    read_fd, write_fd = os.pipe()
+    handler = InputHandler(stream=_Stream(read_fd))
+    try:
+        handler.start()
+        os.close(write_fd)
+        handler.join(2)
+        assert not handler.is_alive()
+    finally:
+        handler.stop()
+        os.close(read_fd)
+
+
+def test_regular_file_input_disables_controls(tmp_path, caplog):
+    """Verifies that a non-pollable stream such as a regular file is handled."""
+    path = tmp_path / "input.txt"
+    path.write_text("p")
+    caplog.set_level(logging.WARNING, logger="chteams.keyboard")
+    with open(path) as stream:
+        handler = InputHandler(stream=stream)
+        try:
+            handler.start()
+            handler.join(2)
+            assert not handler.is_alive()
+        finally:
+            handler.stop()
+    assert not handler.pause_requested.is_set()
+    assert "keyboard controls disabled" in caplog.text
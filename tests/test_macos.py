@@ -1,5 +1,6 @@
 from unittest.mock import MagicMock, patch
 from chteams.macos import MacOSController
+from chteams.targets import SLACK, TEAMS, InteractionError
 import subprocess
 import pytest
 
@@ -29,7 +30,7 @@ def test_stop_caffeinate():
 def test_focus_teams_success():
     controller = MacOSController()
     with patch("subprocess.run") as mock_run:
-        controller.focus_teams_and_interact()
+        controller.interact([TEAMS])
         assert mock_run.called
         # Check that osascript was called
         args, kwargs = mock_run.call_args
@@ -41,9 +42,9 @@ def test_focus_teams_failure():
     with patch(
         "subprocess.run",
         side_effect=subprocess.CalledProcessError(1, "cmd", stderr=b"error"),
-    ), pytest.raises(RuntimeError) as excinfo:
-        controller.focus_teams_and_interact()
-    assert "Failed to interact with Teams: error" in str(excinfo.value)
+    ), pytest.raises(InteractionError) as excinfo:
+        controller.interact([TEAMS])
+    assert excinfo.value.failures == {TEAMS.name: "error"}
 
 
 def test_get_frontmost_app():
@@ -52,3 +53,56 @@ def test_get_frontmost_app():
         mock_run.return_value = MagicMock(stdout="Terminal\n")
         assert controller.get_frontmost_app() == "Terminal"
         mock_run.assert_called_once()
+
+
+def test_interact_serves_targets_in_one_focus_cycle():
+    """Verifies that several targets share one frontmost lookup and restore."""
+    controller = MacOSController()
+    with patch.object(controller, "get_frontmost_app", return_value="Terminal") as mock_front, \
+         patch.object(controller, "activate_app") as mock_activate, \
+         patch("subprocess.run") as mock_run:
+        controller.interact([TEAMS, SLACK])
+    mock_front.assert_called_once()
+    mock_activate.assert_called_once_with("Terminal")
+    scripts = [call.args[0][2] for call in mock_run.call_args_list]
+    assert 'tell application "Microsoft Teams"' in scripts[0]
+    assert 'tell application "Slack"' in scripts[1]
+
+
+def test_interact_reports_failed_targets():
+    """Verifies that failures are collected per target and focus is still restored."""
+    controller = MacOSController()
+    error = subprocess.CalledProcessError(1, "cmd", stderr=b"no slack")
+    with patch.object(controller, "get_frontmost_app", return_value="Terminal"), \
+         patch.object(controller, "activate_app") as mock_activate, \
+         patch("subprocess.run", side_effect=[MagicMock(), error]), \
+         pytest.raises(InteractionError) as excinfo:
+        controller.interact([TEAMS, SLACK])
+    assert excinfo.value.failures == {"slack": "no slack"}
+    mock_activate.assert_called_once_with("Terminal")
+
+
+def test_interact_skips_round_trip_when_target_is_frontmost():
+    """Verifies that no activation or restore happens for a frontmost target."""
+    controller = MacOSController()
+    with patch.object(controller, "get_frontmost_app") as mock_front, \
+         patch.object(controller, "activate_app") as mock_activate, \
+         patch("subprocess.run") as mock_run:
+        controller.interact([TEAMS], frontmost_app="Microsoft Teams")
+    mock_front.assert_not_called()
+    mock_activate.assert_not_called()
+    script = mock_run.call_args.args[0][2]
+    assert "activate" not in script
+    assert "keystroke" in script
+
+
+def test_interact_restores_focus_when_frontmost_target_fails():
+    """Verifies that a failing frontmost target still gets focus restored after others."""
+    controller = MacOSController()
+    error = subprocess.CalledProcessError(1, "cmd", stderr=b"no teams")
+    with patch.object(controller, "activate_app") as mock_activate, \
+         patch("subprocess.run", side_effect=[MagicMock(), error]), \
+         pytest.raises(InteractionError) as excinfo:
+        controller.interact([TEAMS, SLACK], frontmost_app="Microsoft Teams")
+    assert excinfo.value.failures == {"teams": "no teams"}
+    mock_activate.assert_called_once_with("Microsoft Teams")
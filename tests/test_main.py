@@ -1,6 +1,7 @@
 """Tests for the main entry point of the chteams utility."""
 
 from unittest.mock import patch, MagicMock
+import pytest
 from chteams.main import main, setup_logging
 
 
@@ -46,7 +47,7 @@ def test_main_success():
         patch("chteams.main.show_banner"),
 
 
-        patch("chteams.main.MacOSController"),
+        patch("chteams.main.create_controller"),
 
 
         patch("chteams.main.ActivityEngine") as mock_engine_class,
@@ -61,7 +62,7 @@ def test_main_success():
     ):
 
 
-        mock_parse.return_value = MagicMock(debug=False)
+        mock_parse.return_value = MagicMock(debug=False, profile=False, backend="macos", interval=240, targets=None, merge_window=30, settle_seconds=5, max_defer=30)
 
 
         mock_engine = MagicMock()
@@ -109,7 +110,7 @@ def test_main_keyboard_interrupt():
         patch("chteams.main.show_banner"),
 
 
-        patch("chteams.main.MacOSController"),
+        patch("chteams.main.create_controller"),
 
 
         patch("chteams.main.ActivityEngine") as mock_engine_class,
@@ -124,7 +125,7 @@ def test_main_keyboard_interrupt():
     ):
 
 
-        mock_parse.return_value = MagicMock(debug=False)
+        mock_parse.return_value = MagicMock(debug=False, profile=False, backend="macos", interval=240, targets=None, merge_window=30, settle_seconds=5, max_defer=30)
 
 
         mock_engine = MagicMock()
@@ -147,3 +148,82 @@ def test_main_keyboard_interrupt():
 
         mock_exit.assert_called_with(0)
 
+
+
+def test_main_builds_fake_backend_from_flags():
+    """Verifies that the fake backend receives its latency and failure options."""
+    argv = [
+        "keep-active",
+        "--backend", "fake",
+        "--interval", "0",
+        "--fake-latency", "0.01",
+        "--fake-failure-rate", "0.5",
+        "--seed", "7",
+    ]
+    with (
+        patch("sys.argv", argv),
+        patch("chteams.main.setup_logging"),
+        patch("chteams.main.show_banner"),
+        patch("chteams.main.create_controller") as mock_create,
+        patch("chteams.main.ActivityEngine") as mock_engine_class,
+        patch("chteams.main.show_summary"),
+    ):
+        mock_engine_class.return_value.run.return_value = ("00:00:01", 3)
+
+        main()
+
+        mock_create.assert_called_once_with(
+            "fake", latency=0.01, latency_jitter=0.0, failure_rate=0.5, seed=7
+        )
+        assert mock_engine_class.call_args.kwargs["interval"] == 0
+
+
+def test_main_passes_targets_and_scheduling_flags():
+    """Verifies that --targets, --merge-window and the focus deferral flags reach the engine."""
+    argv = [
+        "keep-active",
+        "--targets", "slack,teams",
+        "--merge-window", "60",
+        "--settle-seconds", "3",
+        "--max-defer", "10",
+    ]
+    with (
+        patch("sys.argv", argv),
+        patch("chteams.main.setup_logging"),
+        patch("chteams.main.show_banner"),
+        patch("chteams.main.create_controller"),
+        patch("chteams.main.ActivityEngine") as mock_engine_class,
+        patch("chteams.main.show_summary"),
+    ):
+        mock_engine_class.return_value.run.return_value = ("00:00:01", 3)
+
+        main()
+
+        kwargs = mock_engine_class.call_args.kwargs
+        assert [target.name for target in kwargs["targets"]] == ["slack", "teams"]
+        assert kwargs["merge_window"] == 60
+        assert kwargs["settle_seconds"] == 3
+        assert kwargs["max_defer"] == 10
+        assert kwargs["interval"] is None  # Each target keeps its own interval
+
+
+def test_main_rejects_short_interval_for_real_backend():
+    """Verifies that intervals below the minimum are only allowed with the fake backend."""
+    with (
+        patch("sys.argv", ["keep-active", "--interval", "0"]),
+        patch("chteams.main.ActivityEngine") as mock_engine_class,
+        pytest.raises(SystemExit),
+    ):
+        main()
+    mock_engine_class.assert_not_called()
+
+
+def test_main_rejects_unknown_target():
+    """Verifies that an unregistered target name is a usage error."""
+    with (
+        patch("sys.argv", ["keep-active", "--targets", "discord"]),
+        patch("chteams.main.ActivityEngine") as mock_engine_class,
+        pytest.raises(SystemExit),
+    ):
+        main()
+    mock_engine_class.assert_not_called()
@@ -0,0 +1,101 @@
+"""Tests for the profiling helpers of the chteams utility."""
+
+import logging
+import threading
+import time
+from unittest.mock import patch
+from chteams.profiling import SessionProfiler, _current_rss_kb, _rss_kb
+
+
+def _busy_wait(seconds):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        pass
+
+
+def test_current_rss_kb_is_positive():
+    """Verifies that the RSS helper reports a sensible value."""
+    assert _current_rss_kb() > 0
+
+
+def test_rss_falls_back_to_labelled_peak_without_procfs():
+    """Verifies that the peak RSS is reported as such where current RSS is unavailable."""
+    with patch("chteams.profiling._current_rss_kb", return_value=0):
+        label, rss_kb = _rss_kb()
+    assert label == "peak RSS"
+    assert rss_kb > 0
+
+
+def test_cycle_collects_samples_within_budget():
+    """Verifies that only the configured number of cycles are sampled."""
+    profiler = SessionProfiler(cycles=1, sample_interval=0.001, snapshot_every=0)
+
+    with profiler.cycle():
+        _busy_wait(0.05)
+    sampled = sum(profiler.samples.values())
+    assert sampled > 0
+    assert any("_busy_wait" in stack for stack in profiler.samples)
+
+    with profiler.cycle():
+        _busy_wait(0.02)
+    assert sum(profiler.samples.values()) == sampled
+    assert profiler.cycle_count == 2
+
+
+def test_sampler_covers_other_threads_and_skips_idle_waits():
+    """Verifies that busy threads are sampled by name and blocked waits are dropped."""
+    profiler = SessionProfiler(cycles=1, sample_interval=0.001, snapshot_every=0)
+    idle = threading.Event()
+    worker = threading.Thread(target=_busy_wait, args=(0.05,), name="worker")
+    sleeper = threading.Thread(target=idle.wait, args=(1,), name="sleeper")
+
+    with profiler.cycle():
+        sleeper.start()
+        worker.start()
+        worker.join()
+    idle.set()
+    sleeper.join()
+
+    assert any(stack.startswith("worker;") and "_busy_wait" in stack for stack in profiler.samples)
+    assert not any(stack.startswith("sleeper;") for stack in profiler.samples)
+
+
+def test_stop_writes_collapsed_stacks(tmp_path):
+    """Verifies that stop() writes 'stack count' lines to the output file."""
+    output = tmp_path / "out.collapsed"
+    profiler = SessionProfiler(output_path=str(output), cycles=1, sample_interval=0.001)
+    profiler.start()
+    with profiler.cycle():
+        _busy_wait(0.02)
+    profiler.stop()
+
+    lines = output.read_text().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert ";" in stack
+    assert int(count) > 0
+
+
+def test_stop_without_samples_writes_nothing(tmp_path):
+    """Verifies that no file is created when nothing was sampled."""
+    output = tmp_path / "out.collapsed"
+    profiler = SessionProfiler(output_path=str(output), cycles=0)
+    profiler.start()
+    profiler.stop()
+    assert not output.exists()
+
+
+def test_snapshot_hides_profiler_allocations(caplog):
+    """Verifies that growth reports leave out the profiler and tracemalloc."""
+    profiler = SessionProfiler(cycles=0, top_stats=50)
+    profiler.start()
+    retained = [object() for _ in range(1000)]
+    with caplog.at_level(logging.INFO, logger="chteams.profiling"):
+        profiler.snapshot()
+    profiler.stop()
+
+    growth = [r.getMessage() for r in caplog.records if r.getMessage().startswith("[PROFILE]   ")]
+    assert any("test_profiling.py" in line for line in growth)
+    assert not any("profiling.py:" in line.replace("test_profiling.py", "") for line in growth)
+    assert not any("tracemalloc.py" in line for line in growth)
+    del retained
@@ -0,0 +1,73 @@
+"""Tests for the multi-target timer-heap scheduler."""
+
+from chteams.scheduler import TargetScheduler
+from chteams.targets import Target
+
+
+def _target(name, interval):
+    return Target(name=name, app_name=name.title(), action_script="", interval=interval)
+
+
+def test_all_targets_due_at_start():
+    """Verifies that every target is served in the first cycle."""
+    scheduler = TargetScheduler([_target("a", 60), _target("b", 90)])
+    assert [t.name for t in scheduler.pop_due(0)] == ["a", "b"]
+    assert scheduler.pop_due(0) == []
+
+
+def test_close_deadlines_are_merged():
+    """Verifies that targets due within the merge window share one cycle."""
+    a, b = _target("a", 100), _target("b", 120)
+    scheduler = TargetScheduler([a, b], merge_window=30)
+    scheduler.reschedule(scheduler.pop_due(0), 0)
+
+    assert scheduler.seconds_until_next(0) == 100
+    assert scheduler.pop_due(99) == []
+    assert [t.name for t in scheduler.pop_due(100)] == ["a", "b"]
+
+
+def test_peek_due_does_not_remove_targets():
+    """Verifies that peeking reports the merged due set and leaves it scheduled."""
+    a, b, c = _target("a", 100), _target("b", 120), _target("c", 300)
+    scheduler = TargetScheduler([a, b, c], merge_window=30)
+    scheduler.reschedule(scheduler.pop_due(0), 0)
+
+    assert scheduler.peek_due(99) == []
+    assert [t.name for t in scheduler.peek_due(100)] == ["a", "b"]
+    assert [t.name for t in scheduler.pop_due(100)] == ["a", "b"]
+
+
+def test_distant_deadlines_are_not_merged():
+    """Verifies that targets outside the merge window keep their own cycle."""
+    a, b = _target("a", 60), _target("b", 300)
+    scheduler = TargetScheduler([a, b], merge_window=30)
+    scheduler.reschedule(scheduler.pop_due(0), 0)
+
+    assert [t.name for t in scheduler.pop_due(60)] == ["a"]
+    scheduler.reschedule([a], 60)
+    assert scheduler.next_deadline("a") == 120
+    assert scheduler.next_deadline("b") == 300
+
+
+def test_remove_and_adjust_intervals():
+    """Verifies that removed targets are skipped and intervals are clamped."""
+    a, b = _target("a", 60), _target("b", 60)
+    scheduler = TargetScheduler([a, b])
+    scheduler.remove("a")
+    assert len(scheduler) == 1
+    assert [t.name for t in scheduler.pop_due(0)] == ["b"]
+
+    scheduler.adjust_intervals(-100, minimum=30)
+    scheduler.reschedule([b], 0)
+    assert scheduler.next_deadline("b") == 30
+    assert [t.name for t in scheduler.pop_all()] == ["b"]
+    assert scheduler.next_deadline() is None
+
+
+def test_decrease_never_raises_interval_below_minimum():
+    """Verifies that intervals already under the minimum are not raised to it."""
+    scheduler = TargetScheduler([_target("a", 0), _target("b", 10)])
+    scheduler.adjust_intervals(-30, minimum=30)
+    assert [t.interval for t in scheduler.targets.values()] == [0, 10]
+    scheduler.adjust_intervals(30, minimum=30)
+    assert [t.interval for t in scheduler.targets.values()] == [30, 40]
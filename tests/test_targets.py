@@ -0,0 +1,24 @@
+"""Tests for the activity target registry."""
+
+import pytest
+from chteams.targets import SLACK, TEAMS, InteractionError, parse_targets
+
+
+def test_parse_targets_keeps_order_and_drops_duplicates():
+    """Verifies that names are case-insensitive and deduplicated in order."""
+    assert parse_targets(" Slack,teams,slack ") == [SLACK, TEAMS]
+
+
+def test_parse_targets_rejects_unknown_or_empty():
+    """Verifies that unknown names and empty lists raise ValueError."""
+    with pytest.raises(ValueError, match="Unknown target"):
+        parse_targets("teams,discord")
+    with pytest.raises(ValueError, match="At least one target"):
+        parse_targets(" , ")
+
+
+def test_interaction_error_lists_failures():
+    """Verifies that the error message names every failed target."""
+    error = InteractionError({"slack": "boom"})
+    assert isinstance(error, RuntimeError)
+    assert "slack: boom" in str(error)
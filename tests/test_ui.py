@@ -25,3 +25,21 @@ def test_show_summary():
         show_summary("00:05:00", 10)
         # Check that it was called multiple times (banner, panel, bye message)
         assert mock_print.call_count >= 3
+
+def test_create_dashboard_with_targets():
+    """Verifies that one row is added per target."""
+    rows = [
+        ("Microsoft Teams", "OK", "12:00:00", "30s", "240s"),
+        ("Slack", "Failed", "Never", "60s", "300s"),
+    ]
+    plain = create_dashboard("Active", "00:01:00", "12:00:00", "30s", 240)
+    panel = create_dashboard("Active", "00:01:00", "12:00:00", "30s", 240, targets=rows)
+    assert panel.renderable.row_count == plain.renderable.row_count + 3
+    per_target = create_dashboard("Active", "00:01:00", "12:00:00", "30s", None, targets=rows)
+    assert per_target.renderable.row_count == panel.renderable.row_count - 1
+
+def test_create_dashboard_with_focus_counts():
+    """Verifies that deferred and skipped counts add a dashboard row."""
+    plain = create_dashboard("Active", "00:01:00", "12:00:00", "30s", 240)
+    panel = create_dashboard("Active", "00:01:00", "12:00:00", "30s", 240, focus=(2, 5))
+    assert panel.renderable.row_count == plain.renderable.row_count + 1